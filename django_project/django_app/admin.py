@@ -1,6 +1,62 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 from .models import Product, Customer, Order
 
-admin.site.register(Product)
-admin.site.register(Customer)
-admin.site.register(Order)
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that takes the row count of unfiltered changelists from the
+    PostgreSQL planner statistics instead of running COUNT(*) over the
+    whole table. Small tables and filtered querysets are counted exactly.
+    """
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            table = queryset.model._meta.db_table
+            with connection.cursor() as cursor:
+                # Partitioned tables keep their statistics on the partitions.
+                cursor.execute(
+                    """
+                    SELECT COALESCE(SUM(GREATEST(reltuples, 0)), 0) FROM pg_class
+                    WHERE relkind <> 'p' AND (oid = %s::regclass OR oid IN (
+                        SELECT inhrelid FROM pg_inherits WHERE inhparent = %s::regclass
+                    ))
+                    """,
+                    [table, table],
+                )
+                estimate = int(cursor.fetchone()[0])
+            if estimate >= self.estimate_threshold:
+                return estimate
+        return super().count
+
+
+class ScalableModelAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(Product)
+class ProductAdmin(ScalableModelAdmin):
+    list_display = ('id', 'name', 'price', 'available')
+    search_fields = ('name',)
+
+
+@admin.register(Customer)
+class CustomerAdmin(ScalableModelAdmin):
+    list_display = ('id', 'name')
+    search_fields = ('name',)
+
+
+@admin.register(Order)
+class OrderAdmin(ScalableModelAdmin):
+    list_display = ('id', 'customer', 'status', 'date')
+    list_select_related = ('customer',)
+    list_filter = ('status', 'date')
+    ordering = ('-date',)
+    autocomplete_fields = ('customer', 'products')
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django_app.schema import generate_schema
+
+class Command(BaseCommand):
+    help = 'Write the OpenAPI schema artifact served at /api/schema/ (docs.json).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', default=settings.API_SCHEMA_PATH,
+                            help='Where to write the schema (defaults to API_SCHEMA_PATH).')
+        parser.add_argument('--check', action='store_true',
+                            help='Fail instead of writing when the file is out of date.')
+
+    def handle(self, *args, **options):
+        path = options['file']
+        content = generate_schema()
+        try:
+            with open(path, 'rb') as f:
+                current = f.read()
+        except FileNotFoundError:
+            current = None
+
+        if current == content:
+            self.stdout.write(f'{path} is up to date.')
+            return
+        if options['check']:
+            raise CommandError(f'{path} is out of date, run build_schema to regenerate it.')
+        with open(path, 'wb') as f:
+            f.write(content)
+        self.stdout.write(f'Wrote {path}.')
@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+BOOT_CODE = (
+    'import django, importlib; django.setup(); '
+    'importlib.import_module({module!r})'
+)
+
+
+def parse_importtime(output):
+    """Parse `python -X importtime` output into (module, self_us, cumulative_us) rows."""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|', 2)
+        if not self_us.strip().isdigit():
+            continue
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+class Command(BaseCommand):
+    help = 'Report per-module import cost of booting the project in a fresh interpreter.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--module', default=settings.ROOT_URLCONF,
+                            help='Module imported after django.setup() (defaults to ROOT_URLCONF).')
+        parser.add_argument('--limit', type=int, default=25,
+                            help='Number of modules to list.')
+        parser.add_argument('--sort', choices=['self', 'cumulative'], default='cumulative')
+
+    def handle(self, *args, **options):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE}
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c',
+             BOOT_CODE.format(module=options['module'])],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f'Booting the project failed:\n{result.stderr.strip()[-2000:]}')
+
+        rows = parse_importtime(result.stderr)
+        key = 1 if options['sort'] == 'self' else 2
+        rows.sort(key=lambda row: row[key], reverse=True)
+
+        self.stdout.write(f'{"cumulative ms":>14} {"self ms":>10}  module')
+        for module, self_us, cumulative_us in rows[:options['limit']]:
+            self.stdout.write(f'{cumulative_us / 1000:14.1f} {self_us / 1000:10.1f}  {module}')
+        total = sum(row[1] for row in rows)
+        self.stdout.write(f'Total import time: {total / 1000:.1f} ms across {len(rows)} modules')
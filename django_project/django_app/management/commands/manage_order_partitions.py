@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from django_app.partitioning import (
+    add_months, create_partition, detach_partition, list_partitions, month_start,
+    partition_name,
+)
+
+class Command(BaseCommand):
+    help = 'Create upcoming monthly order partitions and archive old ones.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=3,
+                            help='Number of future months to create partitions for.')
+        parser.add_argument('--retain-months', type=int, default=None,
+                            help='Detach partitions older than this many months.')
+        parser.add_argument('--drop', action='store_true',
+                            help='Drop detached partitions instead of keeping them as archive tables.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Order partitioning requires PostgreSQL.')
+
+        current = month_start(timezone.now())
+        with transaction.atomic(), connection.cursor() as cursor:
+            existing = set(list_partitions(cursor))
+            for offset in range(options['months_ahead'] + 1):
+                month = add_months(current, offset)
+                if month not in existing:
+                    create_partition(cursor, month)
+                    self.stdout.write(f'Created {partition_name(month)}')
+
+            if options['retain_months'] is not None:
+                oldest_kept = add_months(current, -options['retain_months'])
+                for month in sorted(existing):
+                    if month < oldest_kept:
+                        detach_partition(cursor, month, drop=options['drop'])
+                        action = 'Dropped' if options['drop'] else 'Archived'
+                        self.stdout.write(f'{action} {partition_name(month)}')
@@ -0,0 +1,57 @@
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+from .routers import has_written, pin_to_primary, unpin
+
+
+class ReplicaPinningMiddleware:
+    """
+    Keeps a request on the primary database when it writes, and keeps the
+    client there for `DATABASE_REPLICA_PIN_SECONDS` afterwards by setting
+    a short-lived cookie, so replication lag is never visible to it.
+    """
+    cookie_name = 'db_primary_pin'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'DATABASE_REPLICAS', []):
+            return self.get_response(request)
+
+        unpin()
+        if self.cookie_name in request.COOKIES or request.method not in SAFE_METHODS:
+            pin_to_primary()
+        try:
+            response = self.get_response(request)
+            wrote = request.method not in SAFE_METHODS or has_written()
+        finally:
+            unpin()
+
+        # Every write restarts the pin window, also for already pinned clients.
+        if wrote:
+            response.set_cookie(
+                self.cookie_name, '1',
+                max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+
+class RateLimitHeadersMiddleware:
+    """
+    Adds X-RateLimit-* headers describing the most restrictive token
+    bucket that applied to the request (see django_app.throttling).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        rate_limit = getattr(request, 'rate_limit', None)
+        if rate_limit is not None:
+            response['X-RateLimit-Limit'] = rate_limit['limit']
+            response['X-RateLimit-Remaining'] = rate_limit['remaining']
+            response['X-RateLimit-Reset'] = rate_limit['reset']
+        return response
@@ -0,0 +1,129 @@
+import datetime
+
+from django.db import migrations
+from django.utils import timezone
+
+# Copied from django_app.partitioning as of this migration, so later
+# changes to that module can't alter what this migration does.
+ORDER_TABLE = 'django_app_order'
+ORDER_PRODUCTS_TABLE = 'django_app_order_products'
+DEFAULT_PARTITION = f'{ORDER_TABLE}_default'
+MONTHS_AHEAD = 3
+
+
+def month_start(value):
+    return datetime.date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def create_partition(cursor, month):
+    # The default partition is still empty here, so no rows need moving.
+    name = f'{ORDER_TABLE}_y{month.year:04d}m{month.month:02d}'
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    cursor.execute(
+        f'CREATE TABLE "{name}" PARTITION OF "{ORDER_TABLE}" '
+        f"FOR VALUES FROM ('{start}') TO ('{end}')"
+    )
+
+
+def partition_order_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        # Pending deferred FK checks would block the index creation below.
+        cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        # A foreign key can only target the partitioned table through its
+        # full primary key (id, date), which the through-table doesn't have.
+        cursor.execute(
+            'SELECT conname FROM pg_constraint '
+            'WHERE conrelid = %s::regclass AND confrelid = %s::regclass',
+            [ORDER_PRODUCTS_TABLE, ORDER_TABLE],
+        )
+        for conname, in cursor.fetchall():
+            cursor.execute(f'ALTER TABLE "{ORDER_PRODUCTS_TABLE}" DROP CONSTRAINT "{conname}"')
+
+        cursor.execute(f'ALTER TABLE "{ORDER_TABLE}" RENAME TO "{ORDER_TABLE}_unpartitioned"')
+        cursor.execute(f"""
+            CREATE TABLE "{ORDER_TABLE}" (
+                "id" integer NOT NULL,
+                "date" timestamp with time zone NOT NULL,
+                "status" varchar(20) NOT NULL,
+                "customer_id" integer NOT NULL
+                    REFERENCES "django_app_customer" ("id") DEFERRABLE INITIALLY DEFERRED,
+                PRIMARY KEY ("id", "date")
+            ) PARTITION BY RANGE ("date")
+        """)
+        cursor.execute(f'CREATE TABLE "{DEFAULT_PARTITION}" PARTITION OF "{ORDER_TABLE}" DEFAULT')
+
+        cursor.execute(f'SELECT MIN("date") FROM "{ORDER_TABLE}_unpartitioned"')
+        oldest = cursor.fetchone()[0] or timezone.now()
+        month = month_start(oldest)
+        last = add_months(month_start(timezone.now()), MONTHS_AHEAD)
+        while month <= last:
+            create_partition(cursor, month)
+            month = add_months(month, 1)
+
+        cursor.execute(f"""
+            INSERT INTO "{ORDER_TABLE}" ("id", "date", "status", "customer_id")
+            SELECT "id", "date", "status", "customer_id" FROM "{ORDER_TABLE}_unpartitioned"
+        """)
+        cursor.execute(f'DROP TABLE "{ORDER_TABLE}_unpartitioned"')
+
+        cursor.execute(f'CREATE SEQUENCE "{ORDER_TABLE}_id_seq" OWNED BY "{ORDER_TABLE}"."id"')
+        cursor.execute(
+            f'ALTER TABLE "{ORDER_TABLE}" ALTER COLUMN "id" '
+            f"SET DEFAULT nextval('{ORDER_TABLE}_id_seq')"
+        )
+        cursor.execute(
+            f"""SELECT setval('{ORDER_TABLE}_id_seq', COALESCE(MAX("id"), 0) + 1, false) """
+            f'FROM "{ORDER_TABLE}"'
+        )
+        cursor.execute(f'CREATE INDEX "{ORDER_TABLE}_customer_id_idx" ON "{ORDER_TABLE}" ("customer_id")')
+        cursor.execute(f'CREATE INDEX "{ORDER_TABLE}_date_idx" ON "{ORDER_TABLE}" ("date")')
+
+
+def unpartition_order_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        # Pending deferred FK checks would block the index creation below.
+        cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        cursor.execute(f"""
+            CREATE TABLE "{ORDER_TABLE}_unpartitioned" (
+                "id" integer NOT NULL PRIMARY KEY GENERATED BY DEFAULT AS IDENTITY,
+                "date" timestamp with time zone NOT NULL,
+                "status" varchar(20) NOT NULL,
+                "customer_id" integer NOT NULL
+                    REFERENCES "django_app_customer" ("id") DEFERRABLE INITIALLY DEFERRED
+            )
+        """)
+        cursor.execute(f"""
+            INSERT INTO "{ORDER_TABLE}_unpartitioned" ("id", "date", "status", "customer_id")
+            SELECT "id", "date", "status", "customer_id" FROM "{ORDER_TABLE}"
+        """)
+        cursor.execute(f'DROP TABLE "{ORDER_TABLE}"')
+        cursor.execute(f'ALTER TABLE "{ORDER_TABLE}_unpartitioned" RENAME TO "{ORDER_TABLE}"')
+        cursor.execute(
+            f"""SELECT setval(pg_get_serial_sequence('{ORDER_TABLE}', 'id'), """
+            f'COALESCE(MAX("id"), 0) + 1, false) FROM "{ORDER_TABLE}"'
+        )
+        cursor.execute(f'CREATE INDEX "{ORDER_TABLE}_customer_id_idx" ON "{ORDER_TABLE}" ("customer_id")')
+        cursor.execute(
+            f'ALTER TABLE "{ORDER_PRODUCTS_TABLE}" ADD FOREIGN KEY ("order_id") '
+            f'REFERENCES "{ORDER_TABLE}" ("id") DEFERRABLE INITIALLY DEFERRED'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_app', '0004_alter_order_date'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_order_table, unpartition_order_table),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_app', '0005_partition_order_by_date'),
+    ]
+
+    operations = [
+        # 0005 already creates the date index on PostgreSQL.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='order',
+                    index=models.Index(fields=['date'], name='django_app_order_date_idx'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    'CREATE INDEX IF NOT EXISTS "django_app_order_date_idx" '
+                    'ON "django_app_order" ("date")',
+                    reverse_sql='DROP INDEX IF EXISTS "django_app_order_date_idx"',
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['status', 'date'], name='django_app_order_status_idx'),
+        ),
+    ]
@@ -1,6 +1,6 @@
 from django.db import models
 from django.core.exceptions import ValidationError
-from django.db.models import Sum
+from django.db.models import F, Sum
 from django.utils import timezone
 
 class Customer(models.Model):
@@ -24,6 +24,7 @@ class Product(models.Model):
     name = models.CharField(max_length=255)          
     price = models.DecimalField(max_digits=10, decimal_places=2)  
     available = models.BooleanField()                
+    version = models.PositiveIntegerField(default=1, editable=False)
 
     def __str__(self):
         return self.name
@@ -34,7 +35,21 @@ class Product(models.Model):
             raise ValidationError('Price must be a positive number.')
         if self.available is None:
             raise ValidationError('Availability must be specified.')
-        super().save(*args, **kwargs)
+        # Bumped in the database on every change so concurrent saves never
+        # share a version and cached renderings keyed on it expire.
+        if self._state.adding:
+            super().save(*args, **kwargs)
+            return
+        previous = self.version
+        self.version = F('version') + 1
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+        try:
+            super().save(*args, **kwargs)
+        except Exception:
+            self.version = previous
+            raise
+        self.refresh_from_db(fields=['version'])
 
 
 class Order(models.Model):
@@ -51,6 +66,12 @@ class Order(models.Model):
     date = models.DateTimeField(default=timezone.now)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['date'], name='django_app_order_date_idx'),
+            models.Index(fields=['status', 'date'], name='django_app_order_status_idx'),
+        ]
+
     def __str__(self):
         return f"Order {self.id} by {self.customer.name}"
 
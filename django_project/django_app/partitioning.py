@@ -0,0 +1,108 @@
+"""
+Monthly range partitions for the order table on PostgreSQL.
+
+The order table is partitioned by `date`, one partition per calendar
+month plus a default partition for rows outside of every known range.
+Partitions are named `django_app_order_yYYYYmMM`.
+"""
+import datetime
+import re
+
+ORDER_TABLE = 'django_app_order'
+ORDER_PRODUCTS_TABLE = 'django_app_order_products'
+DEFAULT_PARTITION = f'{ORDER_TABLE}_default'
+PARTITION_RE = re.compile(r'^%s_y(\d{4})m(\d{2})$' % ORDER_TABLE)
+
+
+def month_start(value):
+    return datetime.date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'{ORDER_TABLE}_y{month.year:04d}m{month.month:02d}'
+
+
+def partition_month(name):
+    match = PARTITION_RE.match(name)
+    if match is None:
+        return None
+    return datetime.date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def list_partitions(cursor):
+    """Return the months of the monthly partitions attached to the order table."""
+    cursor.execute(
+        """
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = %s
+        """,
+        [ORDER_TABLE],
+    )
+    months = (partition_month(name) for name, in cursor.fetchall())
+    return sorted(month for month in months if month is not None)
+
+
+def create_partition(cursor, month):
+    """
+    Create the partition for `month`. Rows of that month which already
+    landed in the default partition are moved into it, since a partition
+    can't be created while the default one holds rows of its range.
+    Must run inside a transaction.
+    """
+    name = partition_name(month)
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    cursor.execute(f'LOCK TABLE "{DEFAULT_PARTITION}" IN EXCLUSIVE MODE')
+    cursor.execute(
+        f'SELECT EXISTS (SELECT 1 FROM "{DEFAULT_PARTITION}" WHERE "date" >= %s AND "date" < %s)',
+        [start, end],
+    )
+    if not cursor.fetchone()[0]:
+        cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{ORDER_TABLE}" '
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+        return
+
+    cursor.execute(f'CREATE TABLE "{name}" (LIKE "{ORDER_TABLE}" INCLUDING DEFAULTS)')
+    cursor.execute(
+        f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" '
+        f'WHERE "date" >= %s AND "date" < %s RETURNING *) '
+        f'INSERT INTO "{name}" SELECT * FROM moved',
+        [start, end],
+    )
+    cursor.execute(
+        f'ALTER TABLE "{ORDER_TABLE}" ATTACH PARTITION "{name}" '
+        f"FOR VALUES FROM ('{start}') TO ('{end}')"
+    )
+
+
+def detach_partition(cursor, month, drop=False):
+    """
+    Detach a monthly partition and move its order/product links into an
+    archive table next to it. With `drop` both are removed instead.
+    """
+    name = partition_name(month)
+    cursor.execute(f'ALTER TABLE "{ORDER_TABLE}" DETACH PARTITION "{name}"')
+    if not drop:
+        # The archive must not depend on the order id sequence, or the
+        # order table could no longer be dropped.
+        cursor.execute(f'ALTER TABLE "{name}" ALTER COLUMN "id" DROP DEFAULT')
+        cursor.execute(
+            f'CREATE TABLE "{name}_products" AS '
+            f'SELECT * FROM "{ORDER_PRODUCTS_TABLE}" '
+            f'WHERE order_id IN (SELECT id FROM "{name}")'
+        )
+    cursor.execute(
+        f'DELETE FROM "{ORDER_PRODUCTS_TABLE}" '
+        f'WHERE order_id IN (SELECT id FROM "{name}")'
+    )
+    if drop:
+        cursor.execute(f'DROP TABLE "{name}"')
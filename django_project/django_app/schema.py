@@ -0,0 +1,59 @@
+import hashlib
+from functools import lru_cache
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.http import condition, require_safe
+
+
+def generate_schema():
+    """Render the OpenAPI schema of the API, as `generateschema` does."""
+    from rest_framework.renderers import OpenAPIRenderer
+    from rest_framework.schemas.openapi import SchemaGenerator
+
+    schema = SchemaGenerator(title='', version='').get_schema(request=None, public=True)
+    return OpenAPIRenderer().render(schema, renderer_context={})
+
+
+@lru_cache(maxsize=None)
+def _schema_artifact():
+    # Served from the file written by `build_schema`; only generated in
+    # process when the artifact is missing.
+    try:
+        content = settings.API_SCHEMA_PATH.read_bytes()
+    except FileNotFoundError:
+        content = generate_schema()
+    return content, hashlib.sha256(content).hexdigest()
+
+
+@require_safe
+@condition(etag_func=lambda request: _schema_artifact()[1])
+def schema_artifact(request):
+    response = HttpResponse(_schema_artifact()[0], content_type='application/vnd.oai.openapi')
+    response['Cache-Control'] = 'public, max-age=%d' % settings.API_SCHEMA_CACHE_TIMEOUT
+    return response
+
+
+@lru_cache(maxsize=None)
+def _swagger_ui_view():
+    # drf_yasg is only imported once the docs are first requested, so
+    # worker boot doesn't pay for the OpenAPI tooling.
+    from drf_yasg import openapi
+    from drf_yasg.views import get_schema_view
+    from rest_framework.permissions import AllowAny
+
+    schema_view = get_schema_view(
+        openapi.Info(
+            title="Software engineering lab",
+            default_version="v1",
+            description="API documentation for the lab",
+            ),
+        public=True,
+        permission_classes=(AllowAny,),
+        authentication_classes=[],
+    )
+    return schema_view.with_ui('swagger', cache_timeout=settings.API_SCHEMA_CACHE_TIMEOUT)
+
+
+def swagger_ui(request, *args, **kwargs):
+    return _swagger_ui_view()(request, *args, **kwargs)
@@ -1,17 +1,31 @@
 from rest_framework import serializers
 from .models import Product, Customer, Order
 
-class ProductSerializer(serializers.ModelSerializer):
+class SparseFieldsetSerializer(serializers.ModelSerializer):
+    """ModelSerializer that can be trimmed with `fields`/`omit` kwargs."""
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        omit = kwargs.pop('omit', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        if omit is not None:
+            for name in set(self.fields) & set(omit):
+                self.fields.pop(name)
+
+class ProductSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Product
         fields = '__all__'
 
-class CustomerSerializer(serializers.ModelSerializer):
+class CustomerSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Customer
         fields = '__all__'
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Order
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
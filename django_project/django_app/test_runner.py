@@ -0,0 +1,76 @@
+import sys
+import time
+import unittest
+
+from django.test.runner import DiscoverRunner
+
+
+class TimedTextTestResult(unittest.TextTestResult):
+    """
+    TextTestResult that keeps how long every test took in `timings`.
+    Python 3.12+ reports durations through addDuration(), including the
+    ones measured in --parallel workers; on older versions the tests are
+    timed between startTest() and stopTest().
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timings = []
+        self._started = {}
+
+    def startTest(self, test):
+        self._started[test] = time.perf_counter()
+        super().startTest(test)
+
+    def addDuration(self, test, elapsed):
+        super().addDuration(test, elapsed)
+        self._started.pop(test, None)
+        self.timings.append((test, elapsed))
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        started = self._started.pop(test, None)
+        if started is not None:
+            self.timings.append((test, time.perf_counter() - started))
+
+
+class TimedTestRunner(DiscoverRunner):
+    """
+    DiscoverRunner that lists the slowest tests after every run, or the
+    number given with `--durations` (0 lists all of them).
+    """
+    slowest_tests = 10
+
+    def get_resultclass(self):
+        return super().get_resultclass() or TimedTextTestResult
+
+    def get_test_runner_kwargs(self):
+        # The report is printed by run_suite() on every Python version.
+        kwargs = super().get_test_runner_kwargs()
+        kwargs.pop('durations', None)
+        return kwargs
+
+    def run_suite(self, suite, **kwargs):
+        result = super().run_suite(suite, **kwargs)
+        self.report_slowest(result)
+        return result
+
+    def report_slowest(self, result):
+        timings = getattr(result, 'timings', None)
+        if timings is None:
+            return
+        if self.parallel > 1 and sys.version_info < (3, 12):
+            # Worker results are replayed here after the fact, so the
+            # times between startTest() and stopTest() mean nothing.
+            self.log(
+                'Test durations are not available with --parallel before '
+                'Python 3.12; use --parallel=1 to list the slowest tests.'
+            )
+            return
+        count = self.slowest_tests if self.durations is None else self.durations
+        slowest = sorted(timings, key=lambda timing: timing[1], reverse=True)
+        if count:
+            slowest = slowest[:count]
+        self.log('\nSlowest test durations\n' + '-' * 70)
+        for test, elapsed in slowest:
+            self.log(f'{elapsed:.3f}s {test}')
@@ -0,0 +1,39 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from django_app.models import Customer, Order, Product
+
+
+class OrderAdminTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(username='testadmin', password='testpassword')
+        cls.product = Product.objects.create(name='Product 1', price=10.00, available=True)
+        customers = Customer.objects.bulk_create(
+            Customer(name=f'Customer {index}', address='123 Main St') for index in range(5)
+        )
+        Order.objects.bulk_create(Order(customer=customer, status='New') for customer in customers)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_changelist_does_not_query_customers_per_row(self):
+        url = reverse('admin:django_app_order_changelist')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        for index in range(5, 10):
+            customer = Customer.objects.create(name=f'Customer {index}', address='123 Main St')
+            Order.objects.create(customer=customer, status='New')
+        with self.assertNumQueries(len(queries)):
+            response = self.client.get(url)
+        self.assertContains(response, 'by Customer 9')
+
+    def test_change_form_uses_autocomplete_for_products(self):
+        order = Order.objects.first()
+        response = self.client.get(reverse('admin:django_app_order_change', args=[order.id]))
+        self.assertContains(response, 'admin-autocomplete')
+        self.assertNotContains(response, '>Product 1</option>')
@@ -1,12 +1,13 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
-from rest_framework.test import APITestCase, APIClient
-from rest_framework import status
+from django.test import TestCase
 from django.urls import reverse
-from django_app.models import Product, Customer, Order
-from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import AccessToken
 
+from django_app.models import Customer, Order, Product
+
 class ProductModelTest(TestCase):
 
     def test_create_product_with_valid_data(self):
@@ -76,10 +77,11 @@ class CustomerModelTest(TestCase):
 
 class OrderModelTest(TestCase):
 
-    def setUp(self):
-        self.customer = Customer.objects.create(name='John Doe', address='123 Main St')
-        self.product1 = Product.objects.create(name='Product 1', price=10.00, available=True)
-        self.product2 = Product.objects.create(name='Product 2', price=20.00, available=False)
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = Customer.objects.create(name='John Doe', address='123 Main St')
+        cls.product1 = Product.objects.create(name='Product 1', price=10.00, available=True)
+        cls.product2 = Product.objects.create(name='Product 2', price=20.00, available=False)
 
     def test_create_order_with_valid_data(self):
         order = Order.objects.create(customer=self.customer, status='New')
@@ -126,13 +128,13 @@ class OrderModelTest(TestCase):
 
 class ProductApiTest(APITestCase):
 
-    def setUp(self):
-        self.client = APIClient()
-        self.regular_user = User.objects.create_user(username='testuser', password='testpassword')
-        self.admin = User.objects.create_superuser(username='testadmin', password='testpassword')
-        self.product = Product.objects.create(name='Temporary Product', price=1.99, available=True)
-        self.product_list_url = reverse('product-list')
-        self.product_detail_url = reverse('product-detail', args=[self.product.id])
+    @classmethod
+    def setUpTestData(cls):
+        cls.regular_user = User.objects.create_user(username='testuser', password='testpassword')
+        cls.admin = User.objects.create_superuser(username='testadmin', password='testpassword')
+        cls.product = Product.objects.create(name='Temporary Product', price=1.99, available=True)
+        cls.product_list_url = reverse('product-list')
+        cls.product_detail_url = reverse('product-detail', args=[cls.product.id])
 
     def test_get_all_products_as_regular_user(self):
         self.token = str(AccessToken.for_user(self.regular_user))
@@ -221,14 +223,14 @@ class ProductApiTest(APITestCase):
 
 class ProductApiNegativeTest(APITestCase):
 
-    def setUp(self):
-        self.client = APIClient()
-        self.regular_user = User.objects.create_user(username='testuser', password='testpassword')
-        self.admin = User.objects.create_superuser(username='testadmin', password='testpassword')
-        self.product = Product.objects.create(name='Temporary Product', price=1.99, available=True)
-        self.product_list_url = reverse('product-list')
-        self.product_detail_url = reverse('product-detail', args=[self.product.id])
-        self.invalid_product_detail_url = reverse('product-detail', args=[999])
+    @classmethod
+    def setUpTestData(cls):
+        cls.regular_user = User.objects.create_user(username='testuser', password='testpassword')
+        cls.admin = User.objects.create_superuser(username='testadmin', password='testpassword')
+        cls.product = Product.objects.create(name='Temporary Product', price=1.99, available=True)
+        cls.product_list_url = reverse('product-list')
+        cls.product_detail_url = reverse('product-detail', args=[cls.product.id])
+        cls.invalid_product_detail_url = reverse('product-detail', args=[999])
 
     def test_create_product_with_invalid_data_as_admin(self):
         self.token = str(AccessToken.for_user(self.admin))
@@ -280,4 +282,49 @@ class ProductApiNegativeTest(APITestCase):
         self.token = str(AccessToken.for_user(self.admin))
         self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
         response = self.client.delete(self.invalid_product_detail_url)
-        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+class SparseFieldsetApiTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.regular_user = User.objects.create_user(username='testuser', password='testpassword')
+        cls.customer = Customer.objects.create(name='John Doe', address='123 Main St')
+        cls.product = Product.objects.create(name='Temporary Product', price=1.99, available=True)
+        cls.order = Order.objects.create(customer=cls.customer, status='New')
+        cls.order.products.add(cls.product)
+        cls.token = str(AccessToken.for_user(cls.regular_user))
+
+    def setUp(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+    def test_fields_trims_response(self):
+        response = self.client.get(reverse('customer-list'), {'fields': 'id,name'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data[0]), {'id', 'name'})
+
+    def test_omit_trims_response(self):
+        response = self.client.get(reverse('customer-list'), {'omit': 'address'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data[0]), {'id', 'name'})
+
+    def test_fields_defers_unselected_columns(self):
+        response = self.client.get(reverse('customer-list'), {'fields': 'id,name'})
+        queryset = response.renderer_context['view'].get_queryset()
+        self.assertEqual(queryset.query.deferred_loading, ({'id', 'name'}, False))
+
+    def test_order_products_prefetched_only_when_requested(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('order-list'), {'fields': 'id,status'})
+        self.assertEqual(set(response.data[0]), {'id', 'status'})
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('order-list'))
+        self.assertEqual(response.data[0]['products'], [self.product.id])
+
+    def test_fields_ignored_on_write(self):
+        admin = User.objects.create_superuser(username='testadmin', password='testpassword')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(admin)}')
+        data = {"name": "Jane Doe", "address": "1 Side St"}
+        response = self.client.post(reverse('customer-list') + '?fields=id', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['address'], '1 Side St')
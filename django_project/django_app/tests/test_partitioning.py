@@ -0,0 +1,128 @@
+import datetime
+import io
+from unittest import skipIf, skipUnless
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from django_app.models import Customer, Order, Product
+from django_app.partitioning import (
+    add_months, create_partition, list_partitions, month_start, partition_month, partition_name,
+)
+
+
+class OrderPartitioningTest(SimpleTestCase):
+
+    def test_month_arithmetic(self):
+        month = month_start(datetime.datetime(2024, 11, 6, 10, 0))
+        self.assertEqual(month, datetime.date(2024, 11, 1))
+        self.assertEqual(add_months(month, 2), datetime.date(2025, 1, 1))
+        self.assertEqual(add_months(month, -11), datetime.date(2023, 12, 1))
+
+    def test_partition_names_round_trip(self):
+        month = datetime.date(2024, 1, 1)
+        self.assertEqual(partition_name(month), 'django_app_order_y2024m01')
+        self.assertEqual(partition_month(partition_name(month)), month)
+        self.assertIsNone(partition_month('django_app_order_default'))
+
+    @skipIf(connection.vendor == 'postgresql', 'Runs only on other backends.')
+    def test_command_requires_postgresql(self):
+        with self.assertRaises(CommandError):
+            call_command('manage_order_partitions')
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Order partitioning requires PostgreSQL.')
+class OrderPartitioningPostgresTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = Customer.objects.create(name='John Doe', address='123 Main St')
+        cls.product = Product.objects.create(name='Product 1', price=10.00, available=True)
+        cls.current = month_start(timezone.now())
+
+    def _order_in(self, month):
+        order = Order.objects.create(
+            customer=self.customer, status='New',
+            date=timezone.make_aware(datetime.datetime(month.year, month.month, 10)),
+        )
+        order.products.add(self.product)
+        return order
+
+    def _partition_of(self, order):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT tableoid::regclass::text FROM django_app_order WHERE id = %s', [order.id])
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    def _table_exists(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT to_regclass(%s) IS NOT NULL', [name])
+            return cursor.fetchone()[0]
+
+    def test_order_table_is_partitioned(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT partstrat FROM pg_partitioned_table WHERE partrelid = 'django_app_order'::regclass"
+            )
+            self.assertEqual(cursor.fetchone(), ('r',))
+
+        order = self._order_in(self.current)
+        self.assertEqual(self._partition_of(order), partition_name(self.current))
+        order.status = 'Sent'
+        order.save()
+        self.assertEqual(Order.objects.get(pk=order.pk).status, 'Sent')
+        self.assertEqual(order.calculate_total_price(), 10)
+        order.delete()
+        self.assertFalse(Order.objects.filter(pk=order.pk).exists())
+        self.assertFalse(Order.products.through.objects.filter(order_id=order.pk).exists())
+
+    def test_command_creates_future_months(self):
+        call_command('manage_order_partitions', months_ahead=6, stdout=io.StringIO())
+        with connection.cursor() as cursor:
+            months = list_partitions(cursor)
+        for offset in range(7):
+            self.assertIn(add_months(self.current, offset), months)
+
+    def test_command_moves_rows_out_of_default_partition(self):
+        future = add_months(self.current, 5)
+        order = self._order_in(future)
+        self.assertEqual(self._partition_of(order), 'django_app_order_default')
+        call_command('manage_order_partitions', months_ahead=6, stdout=io.StringIO())
+        self.assertEqual(self._partition_of(order), partition_name(future))
+        self.assertTrue(Order.objects.get(pk=order.pk).products.exists())
+
+    def _old_order(self):
+        old = add_months(self.current, -14)
+        order = self._order_in(old)
+        with connection.cursor() as cursor:
+            create_partition(cursor, old)
+        self.assertEqual(self._partition_of(order), partition_name(old))
+        return old, order
+
+    def test_retain_months_archives_old_partitions(self):
+        old, order = self._old_order()
+        recent = self._order_in(self.current)
+        call_command('manage_order_partitions', retain_months=12, stdout=io.StringIO())
+
+        self.assertFalse(Order.objects.filter(pk=order.pk).exists())
+        self.assertTrue(Order.objects.filter(pk=recent.pk).exists())
+        self.assertFalse(Order.products.through.objects.filter(order_id=order.pk).exists())
+        self.assertTrue(Order.products.through.objects.filter(order_id=recent.pk).exists())
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT id FROM "{partition_name(old)}"')
+            self.assertEqual(cursor.fetchall(), [(order.id,)])
+            cursor.execute(f'SELECT order_id, product_id FROM "{partition_name(old)}_products"')
+            self.assertEqual(cursor.fetchall(), [(order.id, self.product.id)])
+            cursor.execute('SELECT COUNT(*) FROM pg_attrdef WHERE adrelid = %s::regclass', [partition_name(old)])
+            self.assertEqual(cursor.fetchone(), (0,))
+
+    def test_retain_months_drops_old_partitions(self):
+        old, order = self._old_order()
+        call_command('manage_order_partitions', retain_months=12, drop=True, stdout=io.StringIO())
+        self.assertFalse(Order.objects.filter(pk=order.pk).exists())
+        self.assertFalse(Order.products.through.objects.filter(order_id=order.pk).exists())
+        self.assertFalse(self._table_exists(partition_name(old)))
+        self.assertFalse(self._table_exists(f'{partition_name(old)}_products'))
@@ -0,0 +1,73 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from django_app.middleware import ReplicaPinningMiddleware
+from django_app.models import Product
+from django_app.routers import PrimaryReplicaRouter, is_pinned, pin_to_primary, unpin
+
+
+@override_settings(DATABASE_REPLICAS=['replica1', 'replica2'])
+class PrimaryReplicaRouterTest(SimpleTestCase):
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+        unpin()
+
+    def tearDown(self):
+        unpin()
+
+    def test_reads_go_to_replicas(self):
+        self.assertIn(self.router.db_for_read(Product), ['replica1', 'replica2'])
+
+    def test_reads_after_write_stick_to_primary(self):
+        self.assertEqual(self.router.db_for_write(Product), 'default')
+        self.assertEqual(self.router.db_for_read(Product), 'default')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_reads_without_replicas_go_to_primary(self):
+        self.assertEqual(self.router.db_for_read(Product), 'default')
+
+    def test_middleware_pins_unsafe_requests_and_sets_cookie(self):
+        seen = []
+        def view(request):
+            seen.append(is_pinned())
+            return HttpResponse()
+        response = ReplicaPinningMiddleware(view)(self.factory.post('/'))
+        self.assertEqual(seen, [True])
+        self.assertIn(ReplicaPinningMiddleware.cookie_name, response.cookies)
+        self.assertFalse(is_pinned())
+
+    def test_middleware_pins_requests_with_cookie(self):
+        seen = []
+        def view(request):
+            seen.append(is_pinned())
+            return HttpResponse()
+        request = self.factory.get('/')
+        request.COOKIES[ReplicaPinningMiddleware.cookie_name] = '1'
+        response = ReplicaPinningMiddleware(view)(request)
+        self.assertEqual(seen, [True])
+        self.assertNotIn(ReplicaPinningMiddleware.cookie_name, response.cookies)
+
+    def test_middleware_refreshes_cookie_on_write_with_cookie(self):
+        def view(request):
+            return HttpResponse()
+        request = self.factory.post('/')
+        request.COOKIES[ReplicaPinningMiddleware.cookie_name] = '1'
+        response = ReplicaPinningMiddleware(view)(request)
+        self.assertIn(ReplicaPinningMiddleware.cookie_name, response.cookies)
+
+    def test_middleware_sets_cookie_when_safe_request_writes(self):
+        def view(request):
+            self.router.db_for_write(Product)
+            return HttpResponse()
+        response = ReplicaPinningMiddleware(view)(self.factory.get('/'))
+        self.assertIn(ReplicaPinningMiddleware.cookie_name, response.cookies)
+
+    def test_middleware_leaves_safe_reads_on_replicas(self):
+        def view(request):
+            return HttpResponse()
+        pin_to_primary()
+        response = ReplicaPinningMiddleware(view)(self.factory.get('/'))
+        self.assertNotIn(ReplicaPinningMiddleware.cookie_name, response.cookies)
+        self.assertFalse(is_pinned())
@@ -0,0 +1,70 @@
+import importlib
+import io
+import os
+import sys
+import tempfile
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+from django.urls import NoReverseMatch, clear_url_caches, reverse
+from rest_framework import status
+
+from django_app.management.commands.import_profile import parse_importtime
+
+
+class StartupProfileTest(SimpleTestCase):
+
+    def test_parse_importtime(self):
+        output = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |        120 |   _io\n'
+            'import time:      3400 |       5000 | django.urls\n'
+            'unrelated line\n'
+        )
+        self.assertEqual(parse_importtime(output), [('_io', 120, 120), ('django.urls', 3400, 5000)])
+
+
+class SwaggerUiTest(TestCase):
+
+    def _reload_urlconf(self):
+        clear_url_caches()
+        importlib.reload(sys.modules['django_app.urls'])
+        importlib.reload(sys.modules['django_project.urls'])
+
+    def test_swagger_ui_is_served(self):
+        # The route only exists when the docs are enabled at URLconf import.
+        self.addCleanup(self._reload_urlconf)
+        with self.settings(API_DOCS_ENABLED=True), \
+                self.modify_settings(INSTALLED_APPS={'append': 'drf_yasg'}):
+            self._reload_urlconf()
+            response = self.client.get(reverse('schema-swagger-ui'), {'format': 'openapi'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_swagger_ui_is_not_routed_when_disabled(self):
+        self.addCleanup(self._reload_urlconf)
+        with self.settings(API_DOCS_ENABLED=False):
+            self._reload_urlconf()
+            with self.assertRaises(NoReverseMatch):
+                reverse('schema-swagger-ui')
+
+
+class SchemaArtifactTest(SimpleTestCase):
+
+    def test_schema_served_with_etag(self):
+        response = self.client.get(reverse('schema'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.content.startswith(b'openapi:'))
+        etag = response['ETag']
+        response = self.client.get(reverse('schema'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_build_schema_regenerates_drifted_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'docs.json')
+            with open(path, 'w') as f:
+                f.write('openapi: 3.0.2\n')
+            with self.assertRaises(CommandError):
+                call_command('build_schema', file=path, check=True, stdout=io.StringIO())
+            call_command('build_schema', file=path, stdout=io.StringIO())
+            call_command('build_schema', file=path, check=True, stdout=io.StringIO())
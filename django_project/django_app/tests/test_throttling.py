@@ -0,0 +1,191 @@
+import os
+import threading
+from unittest import mock, skipUnless
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from django_app.throttling import ScopedTokenBucketThrottle
+from django_app.views import OrderViewSet
+
+
+class ThrottlingApiTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.regular_user = User.objects.create_user(username='testuser', password='testpassword')
+        cls.token = str(AccessToken.for_user(cls.regular_user))
+
+    def setUp(self):
+        cache.clear()
+
+    def test_token_endpoint_bucket_runs_out(self):
+        rates = {**ScopedTokenBucketThrottle.THROTTLE_RATES, 'token': '3/min'}
+        data = {'username': 'testuser', 'password': 'wrongpassword'}
+        with mock.patch.object(ScopedTokenBucketThrottle, 'THROTTLE_RATES', rates), \
+                mock.patch.object(ScopedTokenBucketThrottle, 'timer', lambda self: 1000.0):
+            for remaining in (2, 1, 0):
+                response = self.client.post(reverse('token_obtain_pair'), data, format='json')
+                self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+                self.assertEqual(response['X-RateLimit-Remaining'], str(remaining))
+            response = self.client.post(reverse('token_obtain_pair'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['X-RateLimit-Limit'], '3')
+        self.assertEqual(response['Retry-After'], '20')
+
+    def test_bucket_refills_over_time(self):
+        rates = {**ScopedTokenBucketThrottle.THROTTLE_RATES, 'token': '3/min'}
+        data = {'username': 'testuser', 'password': 'wrongpassword'}
+        now = [1000.0]
+        with mock.patch.object(ScopedTokenBucketThrottle, 'THROTTLE_RATES', rates), \
+                mock.patch.object(ScopedTokenBucketThrottle, 'timer', lambda self: now[0]):
+            for _ in range(3):
+                self.client.post(reverse('token_obtain_pair'), data, format='json')
+            now[0] += 20
+            response = self.client.post(reverse('token_obtain_pair'), data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+            response = self.client.post(reverse('token_obtain_pair'), data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_order_list_concurrency_cap(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        key = f'concurrency_orders_{self.regular_user.pk}'
+        response = self.client.get(reverse('order-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(cache.get(key), 0)
+
+        cache.set(key, 2)
+        response = self.client.get(reverse('order-list'))
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(cache.get(key), 2)
+
+
+    def test_concurrency_counter_expiring_before_incr_is_retried(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        key = f'concurrency_orders_{self.regular_user.pk}'
+        real_incr = cache.incr
+        expired = []
+
+        def incr(name, *args, **kwargs):
+            if not expired:
+                expired.append(name)
+                cache.delete(name)
+                raise ValueError(f"Key '{name}' not found")
+            return real_incr(name, *args, **kwargs)
+
+        with mock.patch.object(cache, 'incr', side_effect=incr), \
+                mock.patch.object(cache, 'touch', wraps=cache.touch) as touch:
+            response = self.client.get(reverse('order-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(expired, [key])
+        touch.assert_called_with(key, OrderViewSet.concurrency_slot_timeout)
+        self.assertEqual(cache.get(key), 0)
+
+
+class _InterleavingCache:
+    """Runs `interleave` right after the first read of the wrapped cache."""
+
+    def __init__(self, backend, interleave):
+        self.backend = backend
+        self.interleave = interleave
+
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+
+    def get(self, key, default=None):
+        value = self.backend.get(key, default)
+        if self.interleave is not None:
+            interleave, self.interleave = self.interleave, None
+            interleave()
+        return value
+
+
+class TokenBucketConcurrencyTest(SimpleTestCase):
+    bucket_key = 'throttle_token_127.0.0.1'
+
+    def setUp(self):
+        self.request = Request(APIRequestFactory().post('/'))
+        self.request.user = AnonymousUser()
+        self.view = mock.Mock(throttle_scope='token')
+        rates = {**ScopedTokenBucketThrottle.THROTTLE_RATES, 'token': '2/min'}
+        for patcher in (
+            mock.patch.object(ScopedTokenBucketThrottle, 'THROTTLE_RATES', rates),
+            mock.patch.object(ScopedTokenBucketThrottle, 'timer', lambda self: 1000.0),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _throttle(self, backend):
+        throttle = ScopedTokenBucketThrottle()
+        throttle.cache = backend
+        return throttle
+
+    def _locmem(self):
+        backend = LocMemCache('token-bucket-tests', {})
+        self.addCleanup(backend.clear)
+        return backend
+
+    def _redis(self):
+        # A prefix of its own keeps the test away from the app's keys.
+        backend = RedisCache(os.getenv('REDIS_URL'), {'KEY_PREFIX': 'token-bucket-tests'})
+        backend.delete(f'{self.bucket_key}_bucket')
+        self.addCleanup(backend.delete, f'{self.bucket_key}_bucket')
+        return backend
+
+    def test_interleaved_requests_share_the_token_count(self):
+        backend = self._locmem()
+        second = self._throttle(backend)
+        results = {}
+        thread = threading.Thread(
+            target=lambda: results.update(second=second.allow_request(self.request, self.view)),
+        )
+        # The second request starts while the first one holds the bucket.
+        first = self._throttle(_InterleavingCache(backend, thread.start))
+        results['first'] = first.allow_request(self.request, self.view)
+        thread.join()
+        self.assertEqual(results, {'first': True, 'second': True})
+        self.assertEqual((first.tokens, second.tokens), (1, 0))
+        self.assertFalse(self._throttle(backend).allow_request(self.request, self.view))
+
+    def test_busy_lock_lets_request_through(self):
+        backend = self._locmem()
+        backend.set(f'{self.bucket_key}_lock', 1)
+        throttle = self._throttle(backend)
+        throttle.lock_timeout = 0.01
+        self.assertTrue(throttle.allow_request(self.request, self.view))
+        self.assertIsNone(backend.get(self.bucket_key))
+
+    @skipUnless(os.getenv('REDIS_URL'), 'Needs a Redis server in REDIS_URL.')
+    def test_redis_bucket_is_shared(self):
+        backend = self._redis()
+        first, second = self._throttle(backend), self._throttle(backend)
+        self.assertTrue(first.allow_request(self.request, self.view))
+        self.assertTrue(second.allow_request(self.request, self.view))
+        self.assertFalse(first.allow_request(self.request, self.view))
+        self.assertIsNone(backend.get(self.bucket_key))
+
+    @skipUnless(os.getenv('REDIS_URL'), 'Needs a Redis server in REDIS_URL.')
+    def test_default_redis_cache_runs_the_script(self):
+        redis_cache = {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+            'KEY_PREFIX': 'token-bucket-tests',
+        }
+        backend = self._redis()
+        with override_settings(CACHES={'default': redis_cache}):
+            throttle = ScopedTokenBucketThrottle()
+            with mock.patch.object(throttle, 'take_token_locked') as take_token_locked:
+                self.assertTrue(throttle.allow_request(self.request, self.view))
+            take_token_locked.assert_not_called()
+            self.assertEqual(throttle.tokens, 1)
+        key = backend.make_and_validate_key(f'{self.bucket_key}_bucket')
+        self.assertEqual(backend._cache.get_client(key).type(key), b'hash')
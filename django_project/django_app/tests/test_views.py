@@ -0,0 +1,65 @@
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.test import TestCase
+from django.urls import reverse
+
+from django_app.models import Product
+
+
+class ProductHtmlViewTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Product.objects.bulk_create(
+            Product(name=f'Product {index}', price=1.99, available=True) for index in range(60)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_product_list_is_paginated(self):
+        response = self.client.get(reverse('product_list'))
+        self.assertEqual(len(response.context['products']), 50)
+        response = self.client.get(reverse('product_list'), {'page': 2})
+        self.assertEqual(len(response.context['products']), 10)
+        self.assertContains(response, 'Product 59')
+
+    def test_save_bumps_version(self):
+        product = Product.objects.get(name='Product 0')
+        self.assertEqual(product.version, 1)
+        product.name = 'Renamed product'
+        product.save(update_fields=['name'])
+        product.refresh_from_db()
+        self.assertEqual(product.version, 2)
+
+    def test_failed_save_keeps_version(self):
+        product = Product.objects.get(name='Product 0')
+        Product.objects.filter(pk=product.pk).delete()
+        product.name = 'Renamed product'
+        with self.assertRaises(DatabaseError):
+            product.save(update_fields=['name'])
+        self.assertEqual(product.version, 1)
+
+    def test_concurrent_saves_get_distinct_versions(self):
+        first = Product.objects.get(name='Product 0')
+        second = Product.objects.get(name='Product 0')
+        first.name = 'First rename'
+        first.save()
+        second.name = 'Second rename'
+        second.save()
+        self.assertEqual((first.version, second.version), (2, 3))
+
+    def test_cached_fragments_follow_product_version(self):
+        product = Product.objects.get(name='Product 0')
+        detail_url = reverse('product_detail', args=[product.id])
+        self.assertContains(self.client.get(detail_url), 'Product 0')
+        self.assertContains(self.client.get(reverse('product_list')), 'Product 0')
+
+        Product.objects.filter(pk=product.pk).update(name='Stale rename')
+        self.assertNotContains(self.client.get(detail_url), 'Stale rename')
+
+        product.refresh_from_db()
+        product.name = 'Renamed product'
+        product.save()
+        self.assertContains(self.client.get(detail_url), 'Renamed product')
+        self.assertContains(self.client.get(reverse('product_list')), 'Renamed product')
@@ -0,0 +1,186 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.redis import RedisCache
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import (
+    AnonRateThrottle, BaseThrottle, ScopedRateThrottle, SimpleRateThrottle, UserRateThrottle,
+)
+
+
+def _record_rate_limit(request, limit, remaining, reset):
+    # Kept on the Django request so RateLimitHeadersMiddleware can report
+    # the most restrictive limit that applied to it.
+    current = getattr(request._request, 'rate_limit', None)
+    if current is None or remaining < current['remaining']:
+        request._request.rate_limit = {'limit': limit, 'remaining': remaining, 'reset': reset}
+
+
+# Refill and take a token in one step on the Redis server.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'last')
+local tokens = tonumber(state[1]) or capacity
+local last = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - last) * capacity / period)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'last', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(period))
+return {allowed, tostring(tokens)}
+"""
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Token bucket version of DRF's SimpleRateThrottle. A rate of '100/min'
+    allows bursts of 100 requests and refills 100 tokens per minute.
+
+    The bucket lives in the default cache, so limits are shared by every
+    worker using the same cache backend (see REDIS_URL in settings). On
+    Redis the refill and take run atomically in a Lua script; other
+    backends serialize them with a `cache.add` lock and let the request
+    through if the lock stays busy for `lock_timeout` seconds.
+    """
+    lock_timeout = 1
+    lock_delay = 0.002
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        capacity, period = self.num_requests, self.duration
+        self.now = self.timer()
+        backend = self.get_backend()
+        if isinstance(backend, RedisCache):
+            allowed, self.tokens = self.take_token_redis(backend, capacity, period)
+        else:
+            allowed, self.tokens = self.take_token_locked(backend, capacity, period)
+
+        _record_rate_limit(
+            request, capacity, int(self.tokens),
+            math.ceil((capacity - self.tokens) * period / capacity),
+        )
+        return allowed
+
+    def get_backend(self):
+        # `cache` is django.core.cache.cache, a proxy that hides which
+        # backend is configured.
+        if self.cache is cache:
+            return caches['default']
+        return self.cache
+
+    def take_token_redis(self, backend, capacity, period):
+        # The script keeps a hash, so it gets a key of its own that the
+        # pickled (tokens, last) of the locked path can never collide with.
+        key = backend.make_and_validate_key(f'{self.key}_bucket')
+        client = backend._cache.get_client(key, write=True)
+        allowed, tokens = client.eval(TOKEN_BUCKET_SCRIPT, 1, key, capacity, period, self.now)
+        return bool(allowed), float(tokens)
+
+    def refill(self, state, capacity, period):
+        tokens, last = state
+        return min(capacity, tokens + max(0, self.now - last) * capacity / period)
+
+    def take_token_locked(self, backend, capacity, period):
+        lock_key = f'{self.key}_lock'
+        deadline = time.monotonic() + self.lock_timeout
+        while not backend.add(lock_key, 1, self.lock_timeout):
+            if time.monotonic() >= deadline:
+                # The holder is stuck; a 429 for a client that still has
+                # tokens is worse than one request over the limit.
+                return True, self.refill(backend.get(self.key, (capacity, self.now)), capacity, period)
+            time.sleep(self.lock_delay)
+
+        try:
+            tokens = self.refill(backend.get(self.key, (capacity, self.now)), capacity, period)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            backend.set(self.key, (tokens, self.now), period)
+        finally:
+            backend.delete(lock_key)
+        return allowed, tokens
+
+    def wait(self):
+        return (1 - self.tokens) * self.duration / self.num_requests
+
+
+class AnonTokenBucketThrottle(AnonRateThrottle, TokenBucketThrottle):
+    """Per-IP bucket for unauthenticated requests (rate scope 'anon')."""
+
+
+class UserTokenBucketThrottle(UserRateThrottle, TokenBucketThrottle):
+    """Per-user bucket for authenticated requests (rate scope 'user')."""
+
+
+class ScopedTokenBucketThrottle(ScopedRateThrottle, TokenBucketThrottle):
+    """Per-client bucket for views that set `throttle_scope`."""
+
+
+class ConcurrencyLimitMixin:
+    """
+    Caps how many requests of one client may be in flight at once for the
+    actions in `concurrency_actions` (all actions when None). Limits come
+    from `settings.API_CONCURRENCY_LIMITS[concurrency_scope]`.
+    """
+    concurrency_scope = None
+    concurrency_actions = None
+    # Slots of crashed workers are given back after this many seconds.
+    concurrency_slot_timeout = 300
+
+    def get_concurrency_key(self, request):
+        limit = settings.API_CONCURRENCY_LIMITS.get(self.concurrency_scope)
+        if limit is None:
+            return None, None
+        action = getattr(self, 'action', None)
+        if self.concurrency_actions is not None and action not in self.concurrency_actions:
+            return None, None
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = BaseThrottle().get_ident(request)
+        return f'concurrency_{self.concurrency_scope}_{ident}', limit
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        key, limit = self.get_concurrency_key(request)
+        if key is None:
+            return
+        for _ in range(3):
+            cache.add(key, 0, self.concurrency_slot_timeout)
+            try:
+                in_flight = cache.incr(key)
+                break
+            except ValueError:
+                # The counter expired between add() and incr().
+                continue
+        else:
+            raise Throttled(wait=1, detail='Too many concurrent requests.')
+        # Keep the counter alive while requests are in flight.
+        cache.touch(key, self.concurrency_slot_timeout)
+        if in_flight > limit:
+            cache.decr(key)
+            raise Throttled(wait=1, detail='Too many concurrent requests.')
+        self.concurrency_key = key
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        key = getattr(self, 'concurrency_key', None)
+        if key is not None:
+            self.concurrency_key = None
+            try:
+                cache.decr(key)
+            except ValueError:
+                pass
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -2,23 +2,9 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import ProductViewSet, CustomerViewSet, OrderViewSet
 from .views import ProductListView, ProductDetailView, ProductCreateView
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-from rest_framework.permissions import AllowAny
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Software engineering lab",
-        default_version="v1",
-        description="API documentation for the lab",
-        ),
-    public=True,
-    permission_classes=(AllowAny,),
-    authentication_classes=[],
-)
-
-
+from .views import ThrottledTokenObtainPairView, ThrottledTokenRefreshView
+from django.conf import settings
+from .schema import schema_artifact
 
 
 router = DefaultRouter()
@@ -34,10 +20,15 @@ urlpatterns = [
     name='product_detail'),
     path('user/products/new/', ProductCreateView.as_view(),
     name='product_create'),
-    path('api/token/', TokenObtainPairView.as_view(),
+    path('api/token/', ThrottledTokenObtainPairView.as_view(),
     name='token_obtain_pair'),
-    path('api/token/refresh/', TokenRefreshView.as_view(),
+    path('api/token/refresh/', ThrottledTokenRefreshView.as_view(),
     name='token_refresh'),
-    path('swagger/', schema_view.with_ui('swagger',
-    cache_timeout=0), name='schema-swagger-ui'),
-]
\ No newline at end of file
+    path('api/schema/', schema_artifact, name='schema'),
+]
+
+if settings.API_DOCS_ENABLED:
+    from .schema import swagger_ui
+    urlpatterns += [
+        path('swagger/', swagger_ui, name='schema-swagger-ui'),
+    ]
\ No newline at end of file
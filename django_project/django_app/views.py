@@ -7,33 +7,97 @@ from .forms import ProductForm
 from rest_framework.permissions import IsAuthenticated
 from .permissions import IsAdminOrReadOnly
 from rest_framework.filters import SearchFilter
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from .throttling import ConcurrencyLimitMixin
 
 
+def _parse_field_list(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
 
+class SparseFieldsetMixin:
+    """
+    Lets read requests pick columns with `?fields=a,b` or `?omit=c`.
 
+    The serializer output is trimmed and the queryset only loads the
+    selected columns; relations listed in `prefetch_fields` are only
+    prefetched when they are part of the response.
+    """
+    prefetch_fields = ()
 
-class ProductViewSet(viewsets.ModelViewSet):
+    def get_sparse_fieldset(self):
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in SAFE_METHODS:
+            return None, None
+        fields = request.query_params.get('fields')
+        omit = request.query_params.get('omit')
+        return (
+            _parse_field_list(fields) if fields is not None else None,
+            _parse_field_list(omit) if omit is not None else None,
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        fields, omit = self.get_sparse_fieldset()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+        if omit is not None:
+            kwargs.setdefault('omit', omit)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields, omit = self.get_sparse_fieldset()
+        if fields is None and omit is None:
+            return queryset.prefetch_related(*self.prefetch_fields)
+
+        selected = set(self.get_serializer_class()(fields=fields, omit=omit).fields)
+        opts = queryset.model._meta
+        concrete = {field.name for field in opts.concrete_fields}
+        if fields is not None:
+            queryset = queryset.only(opts.pk.name, *(concrete & selected))
+        else:
+            queryset = queryset.defer(*(concrete - selected - {opts.pk.name}))
+        return queryset.prefetch_related(
+            *(name for name in self.prefetch_fields if name in selected)
+        )
+
+
+class ProductViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
     filter_backends = (SearchFilter,)
     search_fields = ['name']
 
-class CustomerViewSet(viewsets.ModelViewSet):
+class CustomerViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
     queryset = Customer.objects.all()
     serializer_class = CustomerSerializer
 
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(ConcurrencyLimitMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
+    prefetch_fields = ('products',)
+    throttle_scope = 'orders'
+    concurrency_scope = 'orders'
+    concurrency_actions = ('list',)
+
+class ThrottledTokenObtainPairView(TokenObtainPairView):
+    __doc__ = TokenObtainPairView.__doc__
+    throttle_scope = 'token'
+
+class ThrottledTokenRefreshView(TokenRefreshView):
+    __doc__ = TokenRefreshView.__doc__
+    throttle_scope = 'token'
 
 class ProductListView(ListView):
     permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
     model = Product
+    queryset = Product.objects.only('id', 'name', 'version').order_by('id')
     template_name = 'product_list.html'
     context_object_name = 'products'
+    paginate_by = 50
 
 class ProductDetailView(DetailView):
     permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
@@ -40,10 +40,20 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'django_app',
     'rest_framework',
-    'drf_yasg',
-
 ]
 
+# Swagger UI at /swagger/; off by default outside of DEBUG so production
+# workers never import drf_yasg.
+API_DOCS_ENABLED = os.getenv('API_DOCS_ENABLED', str(DEBUG)).lower() in ('1', 'true', 'yes')
+
+if API_DOCS_ENABLED:
+    INSTALLED_APPS.append('drf_yasg')
+
+# OpenAPI schema artifact written by `manage.py build_schema` and served
+# at /api/schema/.
+API_SCHEMA_PATH = BASE_DIR.parent / 'docs.json'
+API_SCHEMA_CACHE_TIMEOUT = int(os.getenv('API_SCHEMA_CACHE_TIMEOUT', 3600))
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
     'rest_framework_simplejwt.authentication.JWTAuthentication',
@@ -51,8 +61,35 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
     'rest_framework.permissions.IsAuthenticated',
 ],
+    'DEFAULT_THROTTLE_CLASSES': [
+    'django_app.throttling.AnonTokenBucketThrottle',
+    'django_app.throttling.UserTokenBucketThrottle',
+    'django_app.throttling.ScopedTokenBucketThrottle',
+],
+    'DEFAULT_THROTTLE_RATES': {
+    'anon': os.getenv('THROTTLE_RATE_ANON', '60/min'),
+    'user': os.getenv('THROTTLE_RATE_USER', '600/min'),
+    'token': os.getenv('THROTTLE_RATE_TOKEN', '10/min'),
+    'orders': os.getenv('THROTTLE_RATE_ORDERS', '120/min'),
+},
 }
 
+# Maximum number of in-flight requests per client for expensive views
+# (see django_app.throttling.ConcurrencyLimitMixin).
+API_CONCURRENCY_LIMITS = {
+    'orders': int(os.getenv('CONCURRENCY_LIMIT_ORDERS', 2)),
+}
+
+# Throttling state lives in the default cache; point REDIS_URL at a shared
+# Redis so the limits hold across worker processes.
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
@@ -62,6 +99,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'django_app.middleware.ReplicaPinningMiddleware',
+    'django_app.middleware.RateLimitHeadersMiddleware',
 ]
 
 ROOT_URLCONF = 'django_project.urls'
@@ -70,8 +109,14 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Templates are compiled once per process.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -90,7 +135,7 @@ WSGI_APPLICATION = 'django_project.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': os.getenv('DATABASE_ENGINE', 'django.db.backends.postgresql'),
         'NAME': os.getenv('DATABASE_NAME'),
         'USER': os.getenv('DATABASE_USER'),
         'PASSWORD': os.getenv('DATABASE_PASSWORD'),
@@ -99,6 +144,26 @@ DATABASES = {
     }
 }
 
+# Read replicas, e.g. DATABASE_REPLICA_HOSTS=replica1,replica2:5433
+# (for SQLite engines each entry is a database file name instead).
+DATABASE_REPLICAS = []
+
+for index, entry in enumerate(
+        filter(None, os.getenv('DATABASE_REPLICA_HOSTS', '').split(',')), start=1):
+    replica = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+    if 'sqlite3' in replica['ENGINE']:
+        replica['NAME'] = entry.strip()
+    else:
+        host, _, port = entry.strip().partition(':')
+        replica.update(HOST=host, PORT=port or replica['PORT'])
+    DATABASES[f'replica{index}'] = replica
+    DATABASE_REPLICAS.append(f'replica{index}')
+
+DATABASE_ROUTERS = ['django_app.routers.PrimaryReplicaRouter']
+
+# How long a client keeps reading from the primary after a write.
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv('DATABASE_REPLICA_PIN_SECONDS', 5))
+
 
 
 # Password validation
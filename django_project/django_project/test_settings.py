@@ -0,0 +1,30 @@
+"""
+Settings for running the test suite without any external services.
+
+Uses an in-memory SQLite database, a local-memory cache and a fast
+password hasher, and reports the slowest tests:
+
+    python manage.py test django_app/tests --settings=django_project.test_settings --parallel
+"""
+
+from .settings import *  # noqa: F401,F403
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+DATABASE_REPLICAS = []
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+TEST_RUNNER = 'django_app.test_runner.TimedTestRunner'